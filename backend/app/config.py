@@ -1,5 +1,6 @@
 """Configuration settings for HealthGuide backend"""
 from pydantic_settings import BaseSettings
+from functools import cached_property
 from typing import List
 import os
 
@@ -10,13 +11,15 @@ class Settings(BaseSettings):
     gemini_api_key: str = ""
     maps_api_key: str = ""
     database_url: str = "sqlite:///./healthguide.db"
+    db_pool_size: int = 10  # persistent connections kept per worker process
+    db_max_overflow: int = 20
     llm_provider: str = "openai"  # openai or gemini
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
     allowed_origins: str = "http://localhost:3000,http://localhost:5173"
     
-    @property
+    @cached_property
     def cors_origins(self) -> List[str]:
         """Parse CORS origins from comma-separated string"""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
@@ -30,10 +33,12 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-# Debug: Print API key status (without showing actual keys)
-if settings.debug:
+
+def print_api_key_status():
+    """Debug: Print API key status (without showing actual keys)"""
+    if not settings.debug:
+        return
     print(f"🔑 API Key Status:")
     print(f"   OpenAI: {'✅ Configured' if settings.openai_api_key and settings.openai_api_key not in ['', 'your_key_here', 'your-api-key'] else '❌ Not configured'}")
     print(f"   Gemini: {'✅ Configured' if settings.gemini_api_key and settings.gemini_api_key not in ['', 'your_key_here', 'your-api-key'] else '❌ Not configured'}")
     print(f"   .env file location: {os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')}")
-
@@ -1,9 +1,13 @@
 """Database setup and session management"""
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Text, JSON, Float, ForeignKey
+from sqlalchemy import create_engine, make_url, event, insert, update, select, bindparam, Column, String, Integer, DateTime, Text, JSON, Float, ForeignKey, Index, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
-from datetime import datetime
-from typing import Optional, List
+from sqlalchemy.orm import sessionmaker, Session, relationship, selectinload, raiseload
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.functions import FunctionElement
+from pydantic import BaseModel
+from typing import Optional, List, Tuple
 import json
 
 from app.config import settings
@@ -11,20 +15,66 @@ from app.config import settings
 Base = declarative_base()
 
 
+class local_now(FunctionElement):
+    """
+    Current local time with sub-second precision, evaluated by the database.
+    Matches the naive local datetime.now() values stored before timestamps moved
+    into SQL, unlike CURRENT_TIMESTAMP (UTC, whole seconds on SQLite).
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(local_now)
+def _compile_local_now(element, compiler, **kw):
+    return "LOCALTIMESTAMP"
+
+
+@compiles(local_now, "sqlite")
+def _compile_local_now_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+
 class ConversationSession(Base):
     """Database model for conversation sessions"""
     __tablename__ = "conversations"
     
     session_id = Column(String, primary_key=True, index=True)
-    messages = Column(JSON, default=list)
+    messages = Column(JSON, default=list)  # Legacy blob, moved into message_rows on first access
     triage_level = Column(String, nullable=True)
     summary = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.now)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    # Timestamps are filled in by the database (local time, see local_now); the SQL-expression
+    # defaults are rendered inline in INSERT/UPDATE so they also apply to tables created
+    # before server_default
+    created_at = Column(DateTime, default=local_now(), server_default=local_now())
+    updated_at = Column(DateTime, default=local_now(), server_default=local_now(), onupdate=local_now())
     red_flag_detected = Column(String, nullable=True)
     
     # Relationship to temperature logs
     temperature_logs = relationship("TemperatureLog", back_populates="session", cascade="all, delete-orphan")
+    
+    # Relationship to chat messages, in conversation order
+    message_rows = relationship("MessageRow", back_populates="session", order_by="MessageRow.idx",
+                                cascade="all, delete-orphan")
+
+
+class MessageRow(Base):
+    """Database model for a single chat message (appended, never rewritten)"""
+    __tablename__ = "conversation_messages"
+    
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String, ForeignKey("conversations.session_id"), nullable=False)
+    idx = Column(Integer, nullable=False)  # Position within the conversation
+    role = Column(String, nullable=False)
+    content = Column(Text, nullable=False, default="")
+    timestamp = Column(String, nullable=True)  # ISO format string
+    
+    # Relationship to conversation session
+    session = relationship("ConversationSession", back_populates="message_rows")
+    
+    __table_args__ = (
+        Index("ix_message_session_idx", "session_id", "idx", unique=True),
+    )
 
 
 class TemperatureLog(Base):
@@ -32,19 +82,54 @@ class TemperatureLog(Base):
     __tablename__ = "temperature_logs"
     
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String, ForeignKey("conversations.session_id"), nullable=False, index=True)
+    session_id = Column(String, ForeignKey("conversations.session_id"), nullable=False)  # Covered by ix_temp_session_recorded
     temperature = Column(Float, nullable=False)
     unit = Column(String, default="F")  # 'F' or 'C'
-    recorded_at = Column(DateTime, default=datetime.now, index=True)
+    recorded_at = Column(DateTime, default=local_now(), server_default=local_now(), index=True)
     notes = Column(Text, nullable=True)
     
     # Relationship to conversation session
     session = relationship("ConversationSession", back_populates="temperature_logs")
+    
+    # Serves get_temperature_history's filter + ORDER BY without a sort step
+    __table_args__ = (
+        Index("ix_temp_session_recorded", "session_id", "recorded_at"),
+    )
+
+
+def _is_memory_sqlite(url) -> bool:
+    """True for in-memory SQLite URLs, where every new connection is a separate empty database"""
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+# Create database engine; pooled connections are reused across requests so the
+# PRAGMAs below run once per connection rather than once per request
+_engine_options = {"connect_args": {"check_same_thread": False}}
+if not _is_memory_sqlite(make_url(settings.database_url)):
+    # In-memory SQLite keeps SQLAlchemy's default single-connection pool
+    _engine_options.update(
+        poolclass=QueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow
+    )
+engine = create_engine(settings.database_url, **_engine_options)
+
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL and relaxed fsync so temperature/conversation writes don't block readers"""
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
-# Create database engine
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Keep attributes loaded after commit so returned rows don't trigger a refresh SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 def get_db() -> Session:
@@ -59,51 +144,184 @@ def get_db() -> Session:
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes on tables that already exist, so add newer ones explicitly
+    for index in TemperatureLog.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
 
 
-def save_conversation(db: Session, session_id: str, messages: list, triage_level: Optional[str] = None, 
-                     summary: Optional[str] = None, red_flag: Optional[str] = None):
-    """Save or update conversation session"""
-    session = db.query(ConversationSession).filter(ConversationSession.session_id == session_id).first()
-    
-    if session:
-        session.messages = messages
-        session.triage_level = triage_level
-        session.summary = summary
-        session.red_flag_detected = red_flag
-        session.updated_at = datetime.now()
+def _append_messages(db: Session, session_id: str, messages: list):
+    """
+    Append message rows to a session. Each row's idx is computed inside its own INSERT
+    as MAX(idx) + 1, so concurrent saves of one session never collide on (session_id, idx).
+    """
+    if not messages:
+        return
+    table = MessageRow.__table__
+    next_idx = select(func.coalesce(func.max(table.c.idx), -1) + 1).where(
+        table.c.session_id == bindparam("sid")
+    ).scalar_subquery()
+    db.execute(insert(table).values(idx=next_idx), [
+        {
+            "sid": session_id,
+            "session_id": session_id,
+            "role": msg.get("role", "user"),
+            "content": msg.get("content", ""),
+            "timestamp": msg.get("timestamp")
+        }
+        for msg in messages
+    ])
+
+
+def _migrate_legacy_messages(db: Session, session_id: str, legacy_messages: Optional[list]) -> bool:
+    """Move messages stored in the legacy JSON column into message rows"""
+    if not legacy_messages:
+        return False
+    table = ConversationSession.__table__
+    _append_messages(db, session_id, legacy_messages)
+    db.execute(update(table).where(table.c.session_id == session_id).values(messages=[]))
+    return True
+
+
+def _upsert_session(db: Session, session_id: str, triage_level: Optional[str],
+                    summary: Optional[str], red_flag: Optional[str]) -> Tuple[Optional[list], bool]:
+    """
+    Insert or update the session row in one statement.
+    Returns (legacy JSON messages, whether the session already has message rows).
+    """
+    table = ConversationSession.__table__
+    message_table = MessageRow.__table__
+    has_rows = select(message_table.c.id).where(
+        message_table.c.session_id == session_id
+    ).exists()
+    stmt = sqlite_insert(table).values(
+        session_id=session_id,
+        messages=[],
+        triage_level=triage_level,
+        summary=summary,
+        red_flag_detected=red_flag
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.session_id],
+        set_={
+            "triage_level": triage_level,
+            "summary": summary,
+            "red_flag_detected": red_flag,
+            "updated_at": local_now()
+        }
+    ).returning(table.c.messages, has_rows)
+    legacy_messages, has_messages = db.execute(stmt).one()
+    return legacy_messages, bool(has_messages)
+
+
+def save_conversation(db: Session, session_id: str, new_messages: list, triage_level: Optional[str] = None,
+                     summary: Optional[str] = None, red_flag: Optional[str] = None,
+                     history: Optional[list] = None):
+    """
+    Save or update conversation session, appending new_messages to its stored messages.
+    history (Message objects or dicts) seeds the stored messages when the session has none
+    yet; it is only serialized in that case.
+    """
+    if engine.dialect.name == "sqlite":
+        legacy_messages, has_messages = _upsert_session(db, session_id, triage_level, summary, red_flag)
     else:
-        session = ConversationSession(
-            session_id=session_id,
-            messages=messages,
-            triage_level=triage_level,
-            summary=summary,
-            red_flag_detected=red_flag
-        )
-        db.add(session)
+        # Query-then-write for backends without INSERT ... ON CONFLICT support here
+        session = db.query(ConversationSession).filter(ConversationSession.session_id == session_id).first()
+        if session:
+            legacy_messages = session.messages
+            session.triage_level = triage_level
+            session.summary = summary
+            session.red_flag_detected = red_flag
+            # Appending message rows alone doesn't UPDATE the session row, so touch it explicitly
+            session.updated_at = local_now()
+        else:
+            legacy_messages = None
+            db.add(ConversationSession(
+                session_id=session_id,
+                messages=[],
+                triage_level=triage_level,
+                summary=summary,
+                red_flag_detected=red_flag
+            ))
+        db.flush()  # write the session row before its message rows
+        has_messages = db.query(MessageRow.id).filter(MessageRow.session_id == session_id).first() is not None
+    
+    if _migrate_legacy_messages(db, session_id, legacy_messages):
+        has_messages = True
+    if not has_messages and history:
+        new_messages = [
+            msg.model_dump(mode="json") if isinstance(msg, BaseModel) else msg
+            for msg in history
+        ] + new_messages
     
+    _append_messages(db, session_id, new_messages)
     db.commit()
-    return session
+
+
+# Loader options for conversation queries (get_conversation has no API caller yet; these
+# keep future callers N+1-free). In debug mode any other relationship access that would
+# emit a lazy-load SELECT raises; identity-map lookups such as log.session still work
+_conversation_load_options = [
+    selectinload(ConversationSession.temperature_logs),
+    selectinload(ConversationSession.message_rows)
+]
+if settings.debug:
+    _conversation_load_options.append(raiseload("*", sql_only=True))
 
 
 def get_conversation(db: Session, session_id: str) -> Optional[ConversationSession]:
-    """Get conversation session by ID"""
-    return db.query(ConversationSession).filter(ConversationSession.session_id == session_id).first()
+    """Get conversation session by ID (temperature logs and messages are loaded eagerly)"""
+    conversation = db.query(ConversationSession).options(
+        *_conversation_load_options
+    ).filter(ConversationSession.session_id == session_id).first()
+    
+    if conversation and _migrate_legacy_messages(db, session_id, conversation.messages):
+        db.commit()
+        db.refresh(conversation, ["messages", "message_rows"])
+    return conversation
 
 
-def save_temperature(db: Session, session_id: str, temperature: float, unit: str = "F", notes: Optional[str] = None) -> TemperatureLog:
-    """Save temperature reading to database"""
-    temp_log = TemperatureLog(
-        session_id=session_id,
-        temperature=temperature,
-        unit=unit,
-        notes=notes,
-        recorded_at=datetime.now()
-    )
-    db.add(temp_log)
+def get_conversation_summary_fields(db: Session, session_id: str):
+    """Get (triage_level, summary, message_count) for a session without loading its messages"""
+    row_count = db.query(func.count(MessageRow.id)).filter(
+        MessageRow.session_id == ConversationSession.session_id
+    ).scalar_subquery()
+    # Sessions not yet migrated still keep their messages in the legacy JSON column
+    legacy_count = func.coalesce(func.json_array_length(ConversationSession.messages), 0)
+    return db.query(
+        ConversationSession.triage_level,
+        ConversationSession.summary,
+        row_count + legacy_count
+    ).filter(ConversationSession.session_id == session_id).one_or_none()
+
+
+def save_temperature(db: Session, session_id: str, temperature: float, unit: str = "F", notes: Optional[str] = None) -> dict:
+    """Save temperature reading to database (Core insert, skipping ORM bookkeeping)"""
+    table = TemperatureLog.__table__
+    values = {
+        "session_id": session_id,
+        "temperature": temperature,
+        "unit": unit,
+        "notes": notes
+    }
+    row = db.execute(insert(table).values(**values).returning(table.c.id, table.c.recorded_at)).one()
+    db.commit()
+    return {"id": row.id, **values, "recorded_at": row.recorded_at}
+
+
+def save_temperatures_bulk(db: Session, rows: List[dict]) -> int:
+    """
+    Save multiple temperature readings with batched Core INSERTs.
+    Rows without recorded_at get the database default.
+    """
+    table = TemperatureLog.__table__
+    # executemany needs the same keys in every row of a batch
+    batches = {}
+    for row in rows:
+        batches.setdefault(frozenset(row), []).append(row)
+    for batch in batches.values():
+        db.execute(insert(table), batch)
     db.commit()
-    db.refresh(temp_log)
-    return temp_log
+    return len(rows)
 
 
 def get_temperature_history(db: Session, session_id: str, limit: int = 50) -> List[TemperatureLog]:
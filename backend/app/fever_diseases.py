@@ -1,5 +1,11 @@
 """Disease-specific fever detection and pattern matching"""
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import ahocorasick  # pyright: ignore[reportMissingImports]
+except ImportError:  # pyahocorasick is optional; fall back to substring checks
+    ahocorasick = None
 
 
 FEVER_PATTERNS = {
@@ -48,36 +54,66 @@ FEVER_PATTERNS = {
 }
 
 
-def identify_fever_type(symptoms: str, temperature: Optional[float] = None) -> Dict:
-    """
-    Identify likely fever type based on symptoms and temperature
-    
-    Args:
-        symptoms: String containing symptoms description
-        temperature: Optional temperature in Fahrenheit
-    
-    Returns:
-        Dictionary with likely disease type, confidence, and information
-    """
-    symptoms_lower = symptoms.lower()
-    scores = {}
-    
-    # Score each disease pattern
+def _build_phrase_index() -> Dict[str, List[Tuple[str, int]]]:
+    """Map every keyword/symptom phrase to the (disease, weight) pairs it scores"""
+    index: Dict[str, List[Tuple[str, int]]] = {}
     for disease, pattern in FEVER_PATTERNS.items():
-        score = 0
-        keyword_matches = []
-        
-        # Check keyword matches
         for keyword in pattern["keywords"]:
-            if keyword in symptoms_lower:
-                score += 1
-                keyword_matches.append(keyword)
-        
-        # Check symptom matches
+            index.setdefault(keyword, []).append((disease, 1))
         for symptom in pattern["symptoms"]:
-            if symptom in symptoms_lower:
-                score += 2  # Symptoms are weighted higher than keywords
-                keyword_matches.append(symptom)
+            # Symptoms are weighted higher than keywords
+            index.setdefault(symptom, []).append((disease, 2))
+    return index
+
+
+class _CompiledPattern(NamedTuple):
+    """Per-disease constants precomputed at import"""
+    total_possible: int
+    pattern: Dict
+
+
+_COMPILED: Dict[str, _CompiledPattern] = {
+    disease: _CompiledPattern(
+        total_possible=len(pattern["keywords"]) + len(pattern["symptoms"]),
+        pattern=pattern
+    )
+    for disease, pattern in FEVER_PATTERNS.items()
+}
+_PHRASE_INDEX = _build_phrase_index()
+
+
+@lru_cache(maxsize=None)
+def _ensure_automaton():
+    """Build (once) an Aho-Corasick automaton over all phrases (None if unavailable)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in _PHRASE_INDEX:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+def _find_phrases(text: str) -> set:
+    """Return the set of known phrases occurring in already-lowercased text"""
+    automaton = _ensure_automaton()
+    if automaton is not None:
+        return {phrase for _, phrase in automaton.iter(text)}
+    return {phrase for phrase in _PHRASE_INDEX if phrase in text}
+
+
+@lru_cache(maxsize=2048)
+def _identify_cached(symptoms_lower: str, temperature: Optional[float]) -> Tuple[str, float, Tuple[Tuple[str, int], ...]]:
+    """Score lowercased symptoms; returns an immutable (likely_type, confidence, scores) tuple"""
+    # Single scan over the text for every disease's phrases
+    phrase_scores = {disease: 0 for disease in FEVER_PATTERNS}
+    for phrase in _find_phrases(symptoms_lower):
+        for disease, weight in _PHRASE_INDEX[phrase]:
+            phrase_scores[disease] += weight
+    
+    scores = {}
+    for disease in _COMPILED:
+        score = phrase_scores[disease]
         
         # Temperature-based scoring
         if temperature:
@@ -89,30 +125,38 @@ def identify_fever_type(symptoms: str, temperature: Optional[float] = None) -> D
                 score += 1
         
         if score > 0:
-            scores[disease] = {
-                "score": score,
-                "matches": keyword_matches,
-                "pattern": pattern
-            }
+            scores[disease] = score
     
     # Determine most likely disease
     if not scores:
         # Default to viral if no matches
         likely_disease = "viral"
         confidence = 0.3
-        info = FEVER_PATTERNS["viral"]
     else:
-        likely_disease = max(scores, key=lambda x: scores[x]["score"])
-        max_score = scores[likely_disease]["score"]
-        total_possible = len(FEVER_PATTERNS[likely_disease]["keywords"]) + len(FEVER_PATTERNS[likely_disease]["symptoms"])
-        confidence = min(max_score / total_possible, 1.0)
-        info = scores[likely_disease]["pattern"]
+        likely_disease = max(scores, key=scores.get)
+        total_possible = _COMPILED[likely_disease].total_possible
+        confidence = min(scores[likely_disease] / total_possible, 1.0)
     
+    return likely_disease, round(confidence, 2), tuple(scores.items())
+
+
+def identify_fever_type(symptoms: str, temperature: Optional[float] = None) -> Dict:
+    """
+    Identify likely fever type based on symptoms and temperature
+    
+    Args:
+        symptoms: String containing symptoms description
+        temperature: Optional temperature in Fahrenheit
+    
+    Returns:
+        Dictionary with likely disease type, confidence, and information
+    """
+    likely_disease, confidence, scores = _identify_cached(symptoms.lower(), temperature)
     return {
         "likely_type": likely_disease,
-        "confidence": round(confidence, 2),
-        "info": info,
-        "all_scores": {k: v["score"] for k, v in scores.items()} if scores else {}
+        "confidence": confidence,
+        "info": _COMPILED[likely_disease].pattern,
+        "all_scores": dict(scores)
     }
 
 
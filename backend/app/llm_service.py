@@ -1,6 +1,7 @@
 """LLM service for HealthGuide triage"""
 import json
 import os
+from functools import lru_cache
 from typing import List, Dict, Optional
 from openai import OpenAI  # pyright: ignore[reportMissingImports]
 import google.generativeai as genai  # pyright: ignore[reportMissingImports]
@@ -19,6 +20,7 @@ def load_prompt_template(file_path: str) -> str:
         return ""
 
 
+@lru_cache(maxsize=None)
 def get_system_prompt() -> str:
     """Get system prompt for HealthGuide"""
     prompt_path = os.path.join(os.path.dirname(__file__), "..", "prompts", "system_prompt_healthguide.txt")
@@ -39,6 +41,7 @@ Always ask one question at a time. Be empathetic and clear."""
     return prompt
 
 
+@lru_cache(maxsize=None)
 def get_triage_prompt() -> str:
     """Get triage prompt template"""
     prompt_path = os.path.join(os.path.dirname(__file__), "..", "prompts", "triage_prompt.txt")
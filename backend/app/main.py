@@ -1,41 +1,46 @@
 """Main FastAPI application for HealthGuide"""
 from fastapi import FastAPI, HTTPException, Depends  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware  # pyright: ignore[reportMissingImports]
-from fastapi.responses import JSONResponse  # pyright: ignore[reportMissingImports]
+from fastapi.responses import ORJSONResponse  # pyright: ignore[reportMissingImports]
 from sqlalchemy.orm import Session  # pyright: ignore[reportMissingImports]
+from contextlib import asynccontextmanager
 from typing import List
 import uuid
 from datetime import datetime
 
-from app.config import settings
+from app.config import settings, print_api_key_status
 from app.models import (
     ConversationRequest, ConversationResponse, TriageResult, TriageLevel,
-    ProviderRequest, Provider, SummaryResponse, Message
+    ProviderRequest, Provider, SummaryResponse, Message, TemperatureReading
+)
+from app.database import (
+    get_db, init_db, save_conversation, get_conversation_summary_fields,
+    save_temperature, save_temperatures_bulk, get_temperature_history
 )
-from app.database import get_db, init_db, save_conversation, get_conversation, save_temperature, get_temperature_history
 from app.llm_service import get_llm_service
 from app.red_flags import check_red_flags, get_red_flag_response
 from app.providers import get_providers
 from app.fever_diseases import identify_fever_type, get_disease_recommendations
+from app import fever_diseases, red_flags
 
 
-def normalize_message_dict(msg_dict: dict) -> dict:
-    """Normalize a message dictionary to ensure all values are JSON serializable"""
-    normalized = {}
-    for key, value in msg_dict.items():
-        if isinstance(value, datetime):
-            # Convert datetime objects to ISO format strings
-            normalized[key] = value.isoformat()
-        else:
-            normalized[key] = value
-    return normalized
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database and pre-build pattern matchers before serving requests"""
+    print_api_key_status()
+    init_db()
+    fever_diseases._ensure_automaton()
+    red_flags._ensure_automaton()
+    yield
 
 
 # Initialize FastAPI app
 app = FastAPI(
     title="HealthGuide - Fever Helpline API",
     description="AI-powered fever triage and guidance system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson serializes large histories and datetimes natively
 )
 
 # CORS middleware
@@ -47,12 +52,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    init_db()
-
-
 # Health check endpoint
 @app.get("/")
 async def root():
@@ -74,6 +73,8 @@ async def triage(
     Main triage endpoint that processes user messages and provides guidance.
     """
     try:
+        now_iso = datetime.now().isoformat()
+        
         # Initialize LLM service with provider from request (or default)
         provider = request.llm_provider or settings.llm_provider
         llm_service = get_llm_service(provider=provider)
@@ -91,51 +92,22 @@ async def triage(
                 enhanced_message = f"{request.message}\n\nSelected symptoms: {symptom_list}"
         
         # Check for red flags FIRST (before any other processing)
-        # Check both the original message and enhanced message
-        red_flag = check_red_flags(request.message) or check_red_flags(enhanced_message)
+        # enhanced_message always contains the original message, so one scan covers both
+        red_flag = check_red_flags(enhanced_message)
         
         # Also check structured symptom data for emergency indicators
         if request.symptom_data and request.symptom_data.emergency_detected:
             red_flag = red_flag or "Emergency symptoms selected via symptom selector"
         if red_flag:
             # Save conversation with red flag
-            # Convert conversation history to dictionaries (handle Message objects, dicts, etc.)
-            conversation_dicts = []
-            for msg in request.conversation_history:
-                if isinstance(msg, dict):
-                    # Normalize dictionary to ensure datetime objects are converted to strings
-                    conversation_dicts.append(normalize_message_dict(msg))
-                elif isinstance(msg, Message):
-                    timestamp = getattr(msg, "timestamp", None)
-                    if isinstance(timestamp, datetime):
-                        timestamp = timestamp.isoformat()
-                    elif timestamp is None:
-                        timestamp = datetime.now().isoformat()
-                    conversation_dicts.append({
-                        "role": msg.role,
-                        "content": msg.content,
-                        "timestamp": timestamp
-                    })
-                else:
-                    timestamp = getattr(msg, "timestamp", None)
-                    if isinstance(timestamp, datetime):
-                        timestamp = timestamp.isoformat()
-                    elif timestamp is None:
-                        timestamp = datetime.now().isoformat()
-                    conversation_dicts.append({
-                        "role": getattr(msg, "role", "user"),
-                        "content": getattr(msg, "content", ""),
-                        "timestamp": timestamp
-                    })
-            
-            messages = conversation_dicts + [
-                {"role": "user", "content": request.message, "timestamp": datetime.now().isoformat()},
-                {"role": "assistant", "content": get_red_flag_response(red_flag), "timestamp": datetime.now().isoformat()}
-            ]
             save_conversation(
                 db=db,
                 session_id=request.session_id,
-                messages=messages,
+                new_messages=[
+                    {"role": "user", "content": request.message, "timestamp": now_iso},
+                    {"role": "assistant", "content": get_red_flag_response(red_flag), "timestamp": now_iso}
+                ],
+                history=request.conversation_history,
                 triage_level=TriageLevel.EMERGENCY.value,
                 red_flag=red_flag
             )
@@ -158,25 +130,7 @@ async def triage(
                 conversation_complete=True
             )
         
-        # Convert conversation history to Message objects
-        messages = []
-        for msg in request.conversation_history:
-            if isinstance(msg, dict):
-                # If it's a dictionary, extract role and content
-                messages.append(Message(
-                    role=msg.get("role", "user"),
-                    content=msg.get("content", "")
-                ))
-            elif isinstance(msg, Message):
-                # If it's already a Message object, use it directly
-                messages.append(msg)
-            else:
-                # Fallback: try to access as object attributes
-                messages.append(Message(
-                    role=getattr(msg, "role", "user"),
-                    content=getattr(msg, "content", "")
-                ))
-        
+        messages = list(request.conversation_history)
         messages.append(Message(role="user", content=request.message))
         
         # Assess triage level
@@ -209,43 +163,14 @@ async def triage(
             conversation_complete = triage_result.next_question is None
         
         # Save conversation to database
-        # Convert conversation history to dictionaries (handle Message objects, dicts, etc.)
-        conversation_dicts = []
-        for msg in request.conversation_history:
-            if isinstance(msg, dict):
-                # Normalize dictionary to ensure datetime objects are converted to strings
-                conversation_dicts.append(normalize_message_dict(msg))
-            elif isinstance(msg, Message):
-                timestamp = getattr(msg, "timestamp", None)
-                if isinstance(timestamp, datetime):
-                    timestamp = timestamp.isoformat()
-                elif timestamp is None:
-                    timestamp = datetime.now().isoformat()
-                conversation_dicts.append({
-                    "role": msg.role,
-                    "content": msg.content,
-                    "timestamp": timestamp
-                })
-            else:
-                timestamp = getattr(msg, "timestamp", None)
-                if isinstance(timestamp, datetime):
-                    timestamp = timestamp.isoformat()
-                elif timestamp is None:
-                    timestamp = datetime.now().isoformat()
-                conversation_dicts.append({
-                    "role": getattr(msg, "role", "user"),
-                    "content": getattr(msg, "content", ""),
-                    "timestamp": timestamp
-                })
-        
-        updated_messages = conversation_dicts + [
-            {"role": "user", "content": request.message, "timestamp": datetime.now().isoformat()},
-            {"role": "assistant", "content": response_message, "timestamp": datetime.now().isoformat()}
-        ]
         save_conversation(
             db=db,
             session_id=request.session_id,
-            messages=updated_messages,
+            new_messages=[
+                {"role": "user", "content": request.message, "timestamp": now_iso},
+                {"role": "assistant", "content": response_message, "timestamp": now_iso}
+            ],
+            history=request.conversation_history,
             triage_level=triage_result.triage_level.value,
             summary=triage_result.summary,
             red_flag=triage_result.red_flag_symptom
@@ -274,13 +199,14 @@ async def triage(
 @app.get("/api/summary/{session_id}", response_model=SummaryResponse)
 async def get_summary(session_id: str, db: Session = Depends(get_db)):
     """Get conversation summary for a session"""
-    conversation = get_conversation(db, session_id)
+    fields = get_conversation_summary_fields(db, session_id)
     
-    if not conversation:
+    if not fields:
         raise HTTPException(status_code=404, detail="Conversation not found")
+    stored_triage_level, stored_summary, message_count = fields
     
     # Get triage result from conversation
-    triage_level = TriageLevel(conversation.triage_level) if conversation.triage_level else TriageLevel.FOLLOW_UP
+    triage_level = TriageLevel(stored_triage_level) if stored_triage_level else TriageLevel.FOLLOW_UP
     
     # Extract recommended steps from messages (simplified)
     recommended_steps = [
@@ -292,10 +218,10 @@ async def get_summary(session_id: str, db: Session = Depends(get_db)):
     
     return SummaryResponse(
         session_id=session_id,
-        summary=conversation.summary or "Fever-related symptoms discussed",
+        summary=stored_summary or "Fever-related symptoms discussed",
         triage_level=triage_level,
         recommended_next_steps=recommended_steps,
-        conversation_count=len(conversation.messages) if conversation.messages else 0
+        conversation_count=message_count or 0
     )
 
 
@@ -380,19 +306,25 @@ async def log_temperature(
 ):
     """Log a temperature reading for a session"""
     try:
-        temp_log = save_temperature(db, session_id, temperature, unit, notes)
-        return {
-            "id": temp_log.id,
-            "session_id": temp_log.session_id,
-            "temperature": temp_log.temperature,
-            "unit": temp_log.unit,
-            "recorded_at": temp_log.recorded_at.isoformat(),
-            "notes": temp_log.notes
-        }
+        return save_temperature(db, session_id, temperature, unit, notes)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error logging temperature: {str(e)}")
 
 
+@app.post("/api/temperature/bulk")
+async def log_temperatures_bulk(readings: List[TemperatureReading], db: Session = Depends(get_db)):
+    """Log multiple temperature readings in one batch"""
+    try:
+        rows = [
+            reading.model_dump(exclude={"recorded_at"} if reading.recorded_at is None else None)
+            for reading in readings
+        ]
+        count = save_temperatures_bulk(db, rows)
+        return {"inserted": count}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error logging temperatures: {str(e)}")
+
+
 @app.get("/api/temperature/{session_id}")
 async def get_temperature_history_endpoint(session_id: str, db: Session = Depends(get_db)):
     """Get temperature history for a session"""
@@ -405,7 +337,7 @@ async def get_temperature_history_endpoint(session_id: str, db: Session = Depend
                     "id": log.id,
                     "temperature": log.temperature,
                     "unit": log.unit,
-                    "recorded_at": log.recorded_at.isoformat(),
+                    "recorded_at": log.recorded_at,
                     "notes": log.notes
                 }
                 for log in temp_logs
@@ -1,5 +1,5 @@
 """Data models for HealthGuide"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional, Dict, Literal
 from datetime import datetime
 from enum import Enum
@@ -47,6 +47,15 @@ class ConversationRequest(BaseModel):
     conversation_history: List[Message] = []
     llm_provider: Optional[str] = "openai"  # openai or gemini
     symptom_data: Optional[SymptomData] = None  # Optional structured symptom data
+    
+    @model_validator(mode="after")
+    def normalize_history(self) -> "ConversationRequest":
+        """Stamp history messages sent without a timestamp, once at parse time"""
+        now = datetime.now()
+        for msg in self.conversation_history:
+            if msg.timestamp is None:
+                msg.timestamp = now
+        return self
 
 
 class ConversationResponse(BaseModel):
@@ -77,6 +86,15 @@ class ProviderRequest(BaseModel):
     provider_type: Optional[str] = None  # clinic, pharmacy, hospital
 
 
+class TemperatureReading(BaseModel):
+    """Temperature reading for bulk logging"""
+    session_id: str
+    temperature: float
+    unit: str = "F"  # 'F' or 'C'
+    notes: Optional[str] = None
+    recorded_at: Optional[datetime] = None  # Defaults to the time the database stores it
+
+
 class SummaryResponse(BaseModel):
     """Response model for summary endpoint"""
     session_id: str
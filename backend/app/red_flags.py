@@ -1,6 +1,12 @@
 """Red flag symptom detection"""
+from functools import lru_cache
 from typing import Optional, Dict, List
 
+try:
+    import ahocorasick  # pyright: ignore[reportMissingImports]
+except ImportError:  # pyahocorasick is optional; fall back to substring checks
+    ahocorasick = None
+
 
 # Red flag symptoms that require immediate emergency care
 RED_FLAG_SYMPTOMS: Dict[str, List[str]] = {
@@ -45,6 +51,24 @@ RED_FLAG_SYMPTOMS: Dict[str, List[str]] = {
 }
 
 
+_RED_FLAG_NAMES = list(RED_FLAG_SYMPTOMS)
+
+
+@lru_cache(maxsize=None)
+def _ensure_automaton():
+    """Build (once) an Aho-Corasick automaton mapping each keyword to its category rank"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, keywords in enumerate(RED_FLAG_SYMPTOMS.values()):
+        for keyword in keywords:
+            keyword = keyword.lower()
+            # A keyword listed under several categories reports the earliest one
+            automaton.add_word(keyword, min(rank, automaton.get(keyword, rank)))
+    automaton.make_automaton()
+    return automaton
+
+
 def check_red_flags(user_input: str) -> Optional[str]:
     """
     Check if user input contains any red flag symptoms.
@@ -53,6 +77,12 @@ def check_red_flags(user_input: str) -> Optional[str]:
     """
     user_input_lower = user_input.lower()
     
+    automaton = _ensure_automaton()
+    if automaton is not None:
+        # Single pass over the input; report the earliest category, as the loop below does
+        ranks = [rank for _, rank in automaton.iter(user_input_lower)]
+        return _RED_FLAG_NAMES[min(ranks)] if ranks else None
+    
     # Check each red flag symptom category
     for symptom, keywords in RED_FLAG_SYMPTOMS.items():
         for keyword in keywords:
@@ -0,0 +1,58 @@
+"""Shared fixtures for HealthGuide backend tests"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """Engine bound to a fresh temporary SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    """Database session on the temporary SQLite file"""
+    session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=db_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(db):
+    """API test client whose requests use the temporary database session"""
+    from fastapi.testclient import TestClient  # pyright: ignore[reportMissingImports]
+    from app.database import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _clear_module_caches(module):
+    """Clear every lru_cache'd function in a matcher module"""
+    for value in vars(module).values():
+        if hasattr(value, "cache_clear"):
+            value.cache_clear()
+
+
+@pytest.fixture(params=["automaton", "fallback"])
+def matcher(request, monkeypatch, matcher_module):
+    """
+    Run a test against both the Aho-Corasick scan and the substring fallback
+    of matcher_module (each test file provides a matcher_module fixture).
+    """
+    if request.param == "automaton":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(matcher_module, "_ensure_automaton", lambda: None)
+    _clear_module_caches(matcher_module)
+    yield request.param
+    monkeypatch.undo()
+    _clear_module_caches(matcher_module)
@@ -0,0 +1,138 @@
+"""Tests for conversation storage"""
+import pytest
+from sqlalchemy import event
+
+from app.models import Message
+from app.database import (
+    ConversationSession, MessageRow, save_conversation, get_conversation,
+    get_conversation_summary_fields, save_temperature
+)
+
+
+LEGACY_MESSAGES = [
+    {"role": "user", "content": "I have a fever", "timestamp": "2024-01-01T10:00:00"},
+    {"role": "assistant", "content": "What's your temperature?", "timestamp": "2024-01-01T10:00:01"},
+    {"role": "user", "content": "101 degrees", "timestamp": "2024-01-01T10:01:00"},
+]
+
+
+def turn(user, assistant):
+    """Build the user/assistant pair one triage call appends"""
+    return [
+        {"role": "user", "content": user, "timestamp": "2024-01-01T11:00:00"},
+        {"role": "assistant", "content": assistant, "timestamp": "2024-01-01T11:00:00"},
+    ]
+
+
+def stored_contents(db, session_id):
+    """Message contents stored for a session, in conversation order"""
+    rows = db.query(MessageRow).filter(MessageRow.session_id == session_id).order_by(MessageRow.idx).all()
+    assert [row.idx for row in rows] == list(range(len(rows)))
+    return [row.content for row in rows]
+
+
+@pytest.fixture
+def legacy_session(db):
+    """Session saved before messages moved out of the JSON column"""
+    db.add(ConversationSession(session_id="legacy", messages=LEGACY_MESSAGES, triage_level="SELF_CARE"))
+    db.commit()
+    return "legacy"
+
+
+def test_history_seeds_new_session_then_turns_append(db):
+    """Test the first save stores history plus the turn, later saves only append"""
+    history = [{"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi"}]
+    save_conversation(db, "s1", turn("I have a fever", "How high?"), history=history)
+    save_conversation(db, "s1", turn("102", "Stay hydrated"),
+                      history=history + turn("I have a fever", "How high?"))
+
+    assert stored_contents(db, "s1") == [
+        "hello", "hi", "I have a fever", "How high?", "102", "Stay hydrated"
+    ]
+
+
+def test_save_conversation_upserts_without_extra_select(db, db_engine):
+    """Test a later turn writes the session row without a separate SELECT round trip"""
+    save_conversation(db, "s1", turn("I have a fever", "How high?"))
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(db_engine, "before_cursor_execute", record_statement)
+    try:
+        save_conversation(db, "s1", turn("102", "Stay hydrated"), history=turn("ignored", "ignored"))
+    finally:
+        event.remove(db_engine, "before_cursor_execute", record_statement)
+    assert statements == ["INSERT", "INSERT"]
+    assert stored_contents(db, "s1") == ["I have a fever", "How high?", "102", "Stay hydrated"]
+
+
+def test_message_history_serialized_when_seeding(db):
+    """Test Message objects passed as history are stored as JSON-ready rows"""
+    history = [Message(role="user", content="hello", timestamp="2024-01-01T09:00:00")]
+    save_conversation(db, "s1", turn("I have a fever", "How high?"), history=history)
+
+    row = db.query(MessageRow).filter(MessageRow.session_id == "s1", MessageRow.idx == 0).one()
+    assert (row.role, row.content, row.timestamp) == ("user", "hello", "2024-01-01T09:00:00")
+
+
+def test_legacy_messages_migrated_on_read(db, legacy_session):
+    """Test get_conversation moves legacy JSON messages into rows"""
+    conversation = get_conversation(db, legacy_session)
+
+    assert [row.content for row in conversation.message_rows] == [msg["content"] for msg in LEGACY_MESSAGES]
+    assert conversation.messages == []
+    assert stored_contents(db, legacy_session) == [msg["content"] for msg in LEGACY_MESSAGES]
+
+
+def test_legacy_messages_migrated_on_write(db, legacy_session):
+    """Test saving a turn to a legacy session keeps its old messages first"""
+    save_conversation(db, legacy_session, turn("Still hot", "Rest"), triage_level="FOLLOW_UP")
+
+    assert stored_contents(db, legacy_session) == [msg["content"] for msg in LEGACY_MESSAGES] + ["Still hot", "Rest"]
+    session = db.query(ConversationSession).filter(ConversationSession.session_id == legacy_session).one()
+    db.refresh(session)
+    assert session.messages == []
+    assert session.triage_level == "FOLLOW_UP"
+
+
+def test_summary_count_for_unmigrated_and_migrated_sessions(db, legacy_session):
+    """Test the summary message count covers legacy JSON and message rows"""
+    assert get_conversation_summary_fields(db, legacy_session) == ("SELF_CARE", None, 3)
+
+    save_conversation(db, legacy_session, turn("Still hot", "Rest"), triage_level="FOLLOW_UP", summary="Fever")
+    assert get_conversation_summary_fields(db, legacy_session) == ("FOLLOW_UP", "Fever", 5)
+
+
+def test_get_conversation_loads_relationships_eagerly(db, db_engine):
+    """Test loaded conversations need no further SELECTs, even under raiseload in debug mode"""
+    save_conversation(db, "s1", turn("I have a fever", "How high?"))
+    save_temperature(db, "s1", 101.5)
+    db.expunge_all()
+
+    conversation = get_conversation(db, "s1")
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", record_statement)
+    try:
+        assert [row.content for row in conversation.message_rows] == ["I have a fever", "How high?"]
+        assert conversation.temperature_logs[0].temperature == 101.5
+        # Back-references resolve from the identity map without SQL
+        assert conversation.message_rows[0].session is conversation
+        assert conversation.temperature_logs[0].session is conversation
+    finally:
+        event.remove(db_engine, "before_cursor_execute", record_statement)
+    assert statements == []
+
+
+def test_summary_fields_missing_session(db):
+    """Test unknown sessions have no summary fields"""
+    assert get_conversation_summary_fields(db, "missing") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""Tests for disease-specific fever detection"""
+import pytest
+from app import fever_diseases
+from app.fever_diseases import FEVER_PATTERNS, identify_fever_type
+
+
+def baseline_identify_fever_type(symptoms, temperature=None):
+    """Reference scoring: the original per-disease substring loop"""
+    symptoms_lower = symptoms.lower()
+    scores = {}
+    for disease, pattern in FEVER_PATTERNS.items():
+        score = 0
+        for keyword in pattern["keywords"]:
+            if keyword in symptoms_lower:
+                score += 1
+        for symptom in pattern["symptoms"]:
+            if symptom in symptoms_lower:
+                score += 2
+        if temperature:
+            if disease == "dengue" and temperature > 103:
+                score += 1
+            elif disease == "malaria" and 100 < temperature < 104:
+                score += 1
+            elif disease == "typhoid" and temperature > 102:
+                score += 1
+        if score > 0:
+            scores[disease] = score
+
+    if not scores:
+        likely_disease, confidence = "viral", 0.3
+    else:
+        likely_disease = max(scores, key=scores.get)
+        pattern = FEVER_PATTERNS[likely_disease]
+        confidence = min(scores[likely_disease] / (len(pattern["keywords"]) + len(pattern["symptoms"])), 1.0)
+    return {
+        "likely_type": likely_disease,
+        "confidence": round(confidence, 2),
+        "info": FEVER_PATTERNS[likely_disease],
+        "all_scores": scores
+    }
+
+
+@pytest.fixture
+def matcher_module():
+    """Module whose matcher paths the shared matcher fixture switches"""
+    return fever_diseases
+
+
+@pytest.mark.parametrize("symptoms, temperature", [
+    ("I have a mild fever", None),
+    ("Rash and joint pain with bleeding gums", 104),
+    ("body ache, fatigue and a cough", None),  # keyword and symptom of the same disease
+    ("shortness of breath and loss of smell", None),  # phrase shared across diseases
+    ("chills chills chills and sweating", 101),  # repeated occurrences count once
+    ("HEADACHE, Nausea, Fever With Chills", None),
+    ("nothing relevant here", 103.5),
+])
+def test_identify_fever_type_matches_baseline(matcher, symptoms, temperature):
+    """Test scoring matches the original per-disease loop"""
+    assert identify_fever_type(symptoms, temperature) == baseline_identify_fever_type(symptoms, temperature)
+
+
+def test_identify_fever_type_result_is_not_shared(matcher):
+    """Test cached results are rebuilt for each caller"""
+    first = identify_fever_type("rash and joint pain")
+    first["all_scores"]["dengue"] = 100
+    assert identify_fever_type("rash and joint pain")["all_scores"]["dengue"] != 100
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,6 +1,23 @@
 """Tests for red flag detection"""
 import pytest
-from app.red_flags import check_red_flags, get_red_flag_response
+from app import red_flags
+from app.red_flags import RED_FLAG_SYMPTOMS, check_red_flags, get_red_flag_response
+
+
+def baseline_check_red_flags(user_input, red_flag_symptoms=RED_FLAG_SYMPTOMS):
+    """Reference detection: the original per-category substring loop"""
+    user_input_lower = user_input.lower()
+    for symptom, keywords in red_flag_symptoms.items():
+        for keyword in keywords:
+            if keyword.lower() in user_input_lower:
+                return symptom
+    return None
+
+
+@pytest.fixture
+def matcher_module():
+    """Module whose matcher paths the shared matcher fixture switches"""
+    return red_flags
 
 
 def test_chest_pain_red_flag():
@@ -41,6 +58,30 @@ def test_red_flag_response():
     assert "chest pain" in response
 
 
+@pytest.mark.parametrize("keyword", [keywords[0] for keywords in RED_FLAG_SYMPTOMS.values()])
+def test_category_matches_baseline(matcher, keyword):
+    """Test each category is reported exactly as the original loop reports it"""
+    user_input = f"Since yesterday: {keyword.upper()} and a fever"
+    assert check_red_flags(user_input) == baseline_check_red_flags(user_input)
+
+
+def test_shared_keyword_reports_earliest_category(monkeypatch):
+    """Test a keyword listed under two categories doesn't remap later keywords"""
+    pytest.importorskip("ahocorasick")
+    symptoms = {
+        "first": ["alpha"],
+        "second": ["beta", "alpha", "gamma"],
+    }
+    monkeypatch.setattr(red_flags, "RED_FLAG_SYMPTOMS", symptoms)
+    monkeypatch.setattr(red_flags, "_RED_FLAG_NAMES", list(symptoms))
+    red_flags._ensure_automaton.cache_clear()
+    try:
+        for user_input in ["alpha", "beta", "gamma", "gamma and alpha"]:
+            assert check_red_flags(user_input) == baseline_check_red_flags(user_input, symptoms)
+    finally:
+        red_flags._ensure_automaton.cache_clear()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -0,0 +1,40 @@
+"""Tests for temperature logging endpoints"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import TemperatureLog
+
+
+def test_bulk_temperature_logging(client, db):
+    """Test bulk logging stores every reading, defaulting recorded_at in the database"""
+    response = client.post("/api/temperature/bulk", json=[
+        {"session_id": "s1", "temperature": 101.2},
+        {"session_id": "s1", "temperature": 38.5, "unit": "C", "notes": "after paracetamol"},
+        {"session_id": "s1", "temperature": 100.4, "recorded_at": "2024-01-01T08:00:00"},
+    ])
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 3}
+
+    logs = db.query(TemperatureLog).order_by(TemperatureLog.id).all()
+    assert [log.temperature for log in logs] == [101.2, 38.5, 100.4]
+    assert logs[1].unit == "C" and logs[1].notes == "after paracetamol"
+    assert all(log.recorded_at is not None for log in logs)
+    assert logs[2].recorded_at.isoformat() == "2024-01-01T08:00:00"
+
+
+def test_bulk_and_single_readings_share_local_clock(client):
+    """Test defaulted bulk readings and single readings are both stamped in local time"""
+    before = datetime.now() - timedelta(seconds=1)
+    client.post("/api/temperature/bulk", json=[{"session_id": "s1", "temperature": 100.0}])
+    client.post("/api/temperature", params={"session_id": "s1", "temperature": 101.0})
+    after = datetime.now() + timedelta(seconds=1)
+
+    history = client.get("/api/temperature/s1").json()["temperatures"]
+    assert len(history) == 2
+    for reading in history:
+        assert before <= datetime.fromisoformat(reading["recorded_at"]) <= after
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""Tests for the triage endpoint"""
+import pytest
+
+from app import main
+from app.database import ConversationSession, MessageRow
+from app.llm_service import MockLLMService
+
+
+HISTORY = [
+    {"role": "user", "content": "Hi, I'm not feeling well", "timestamp": "2024-01-01T10:00:00"},
+    {"role": "assistant", "content": "What symptoms do you have?", "timestamp": "2024-01-01T10:00:01"},
+]
+
+
+@pytest.fixture(autouse=True)
+def mock_llm(monkeypatch):
+    """Answer triage requests with the rule-based mock instead of a real LLM"""
+    monkeypatch.setattr(main, "get_llm_service", lambda provider=None: MockLLMService())
+
+
+def stored_rows(db, session_id):
+    """Message rows stored for a session, in conversation order"""
+    return db.query(MessageRow).filter(MessageRow.session_id == session_id).order_by(MessageRow.idx).all()
+
+
+def test_first_turn_stores_history_and_turn(client, db):
+    """Test the first triage call stores the client history plus the new turn"""
+    response = client.post("/api/triage", json={
+        "session_id": "s1", "message": "I have a mild fever", "conversation_history": HISTORY
+    })
+    assert response.status_code == 200
+
+    rows = stored_rows(db, "s1")
+    assert [(row.role, row.content) for row in rows[:3]] == [
+        ("user", "Hi, I'm not feeling well"),
+        ("assistant", "What symptoms do you have?"),
+        ("user", "I have a mild fever"),
+    ]
+    assert rows[0].timestamp == "2024-01-01T10:00:00"
+    assert rows[3].role == "assistant" and rows[3].content == response.json()["message"]
+    assert len(rows) == 4
+
+
+def test_second_turn_appends_only_new_messages(client, db):
+    """Test a later call with the full client history appends just the new turn"""
+    first = client.post("/api/triage", json={
+        "session_id": "s1", "message": "I have a mild fever", "conversation_history": HISTORY
+    }).json()
+    full_history = HISTORY + [
+        {"role": "user", "content": "I have a mild fever"},
+        {"role": "assistant", "content": first["message"]},
+    ]
+
+    response = client.post("/api/triage", json={
+        "session_id": "s1", "message": "It started yesterday", "conversation_history": full_history
+    })
+    assert response.status_code == 200
+
+    rows = stored_rows(db, "s1")
+    assert len(rows) == 6
+    assert [row.content for row in rows[4:]] == ["It started yesterday", response.json()["message"]]
+
+
+def test_red_flag_takes_emergency_path(client, db):
+    """Test a red flag message is escalated and stored as an emergency"""
+    response = client.post("/api/triage", json={
+        "session_id": "s1", "message": "I have chest pain and fever", "conversation_history": HISTORY
+    })
+    assert response.status_code == 200
+    result = response.json()["triage_result"]
+    assert result["triage_level"] == "EMERGENCY"
+    assert result["red_flag_symptom"] == "chest pain or pressure"
+
+    session = db.query(ConversationSession).filter(ConversationSession.session_id == "s1").one()
+    db.refresh(session)
+    assert session.triage_level == "EMERGENCY"
+    assert session.red_flag_detected == "chest pain or pressure"
+    assert len(stored_rows(db, "s1")) == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])